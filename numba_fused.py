@@ -0,0 +1,50 @@
+import os
+
+import numba
+import numpy as np
+from numba import njit, prange
+
+# Limit Numba's worker threads to physical cores, like cv2.setNumThreads does
+# for OpenCV (one thread per logical core oversubscribes hyperthreads)
+# Note: Numba rejects values above NUMBA_NUM_THREADS, which follows the CPU
+# affinity mask (taskset, container CPU limits) or the environment variable
+numba.set_num_threads(
+    max(1, min(numba.config.NUMBA_NUM_THREADS, (os.cpu_count() or 2) // 2))
+)
+
+# Luminance weights for BGR -> grayscale (ITU-R BT.601, same as cv2.COLOR_BGR2GRAY)
+BLUE_WEIGHT = 0.114
+GREEN_WEIGHT = 0.587
+RED_WEIGHT = 0.299
+
+@njit(parallel=True, fastmath=True, cache=True)
+def flip_gray(bgr, flipped, gray):
+    """
+    Mirror a BGR frame horizontally and convert it to grayscale in one pass.
+
+    Equivalent to cv2.flip(bgr, 1) followed by cv2.cvtColor(..., COLOR_BGR2GRAY),
+    but reads each source pixel only once.
+
+    Args:
+        bgr: Source frame of shape (H, W, 3), dtype uint8
+        flipped: Output buffer of shape (H, W, 3) for the mirrored color frame
+        gray: Output buffer of shape (H, W) for the mirrored grayscale frame
+    """
+    height, width = gray.shape
+
+    # Rows are independent, so they are split across threads
+    for y in prange(height):
+        for x in range(width):
+            blue = bgr[y, x, 0]
+            green = bgr[y, x, 1]
+            red = bgr[y, x, 2]
+
+            mirrored_x = width - 1 - x
+            flipped[y, mirrored_x, 0] = blue
+            flipped[y, mirrored_x, 1] = green
+            flipped[y, mirrored_x, 2] = red
+
+            # Add 0.5 to round to nearest like OpenCV does
+            gray[y, mirrored_x] = np.uint8(
+                BLUE_WEIGHT * blue + GREEN_WEIGHT * green + RED_WEIGHT * red + 0.5
+            )
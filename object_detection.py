@@ -1,61 +1,188 @@
+import functools
+import os
+
 import cv2
+import numpy as np
+
+# Limit OpenCV's worker threads to physical cores (hyperthreads cause cache thrashing)
+# Note: os.cpu_count() reports logical cores, usually 2 per physical core
+cv2.setNumThreads(max(1, (os.cpu_count() or 2) // 2))
 
-input("Look at the camera. Press Enter to start face detection...")
+input("Look at the camera. Press Enter to start face detection (press q to quit)...")
 
-# Path to the pre-trained Haar Cascade model for face detection
+# Path to the YuNet DNN face detection model (download it from the OpenCV Model Zoo)
+YUNET_MODEL = "face_detection_yunet.onnx"
+
+# Path to the pre-trained Haar Cascade model, used when the YuNet model is missing
 HAARCASCADE_MODEL = "haarcascade_frontalface_default.xml"
 
-# Load the pre-trained face detector model from OpenCV's data directory
-# Note: cv2.data.haarcascades contains the path to OpenCV's built-in Haar Cascades
-face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + HAARCASCADE_MODEL)
+# Haar Cascade detection parameters
+# - SCALE_FACTOR: How much the image size is reduced at each scale (1.1 = 10% reduction)
+# - MIN_NEIGHBORS: How many neighbors each candidate rectangle should have to retain it
+# - MIN_FACE_SIZE: Minimum possible object size (skips the smallest pyramid levels)
+SCALE_FACTOR = 1.1
+MIN_NEIGHBORS = 5
+MIN_FACE_SIZE = (60, 60)
+
+@functools.lru_cache(maxsize=4)
+def load_cascade(name):
+    """
+    Load a Haar Cascade once and reuse it on later calls.
+
+    Args:
+        name: File name of the cascade XML
+
+    Returns:
+        cv2.CascadeClassifier loaded from a local copy of the file if present,
+        otherwise from OpenCV's data directory
+    """
+    # A local copy skips the lookup in OpenCV's data directory
+    # Note: cv2.data.haarcascades contains the path to OpenCV's built-in Haar Cascades
+    path = name if os.path.isfile(name) else cv2.data.haarcascades + name
+    return cv2.CascadeClassifier(path)
+
+if os.path.isfile(YUNET_MODEL):
+    # Run inference through OpenVINO when this OpenCV build supports it,
+    # otherwise use OpenCV's own (SIMD-optimized) DNN backend
+    if cv2.dnn.DNN_TARGET_CPU in cv2.dnn.getAvailableTargets(cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE):
+        DNN_BACKEND = cv2.dnn.DNN_BACKEND_INFERENCE_ENGINE
+    else:
+        DNN_BACKEND = cv2.dnn.DNN_BACKEND_OPENCV
+
+    # Load the DNN face detector once; the input size is set per frame before detecting
+    face_detector = cv2.FaceDetectorYN.create(
+        YUNET_MODEL,
+        "",
+        (320, 320),
+        backend_id=DNN_BACKEND,
+        target_id=cv2.dnn.DNN_TARGET_CPU
+    )
+    face_cascade = None
+else:
+    print(f"Warning: {YUNET_MODEL} not found, falling back to Haar Cascade")
+    face_detector = None
+
+    # Load the pre-trained face detector model (cached across calls)
+    face_cascade = load_cascade(HAARCASCADE_MODEL)
 
 # Initialize video capture from default camera (index 0)
 cap = cv2.VideoCapture(0)
 
-# Read a single frame from the camera
-ret, frame = cap.read()
-if not ret:
-    print("Error: Failed to grab initial frame from camera")
-    exit()  # Exit if frame capture fails
-
-# Mirror the frame horizontally for more intuitive user experience (like a mirror)
-mirrored_frame = cv2.flip(frame, 1)
-
-# Convert the color frame to grayscale (Haar Cascades work on grayscale images)
-gray = cv2.cvtColor(mirrored_frame, cv2.COLOR_BGR2GRAY)
-
-# Detect faces using the Haar Cascade classifier
-# Parameters:
-# - scaleFactor: How much the image size is reduced at each scale (1.1 = 10% reduction)
-# - minNeighbors: How many neighbors each candidate rectangle should have to retain it
-# - minSize: Minimum possible object size (not specified here)
-# - flags: (legacy parameter, not needed in newer OpenCV)
-faces = face_cascade.detectMultiScale(
-    gray,
-    scaleFactor=1.1,
-    minNeighbors=5
-)
+# Keep only the most recent frame in the driver-side buffer (avoids stale frames)
+cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+# Request MJPG frames for higher capture FPS (not all backends accept it)
+try:
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+except cv2.error as e:
+    print(f"Warning: Could not set camera FOURCC: {e}")
+
+# Request 640x480 at 30 FPS (detection quality saturates around this resolution)
+CAMERA_WIDTH = 640
+CAMERA_HEIGHT = 480
+CAMERA_FPS = 30
+cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+cap.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
+
+# The driver may pick the closest supported mode, so report what it chose
+actual_width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+actual_height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+if (actual_width, actual_height) != (CAMERA_WIDTH, CAMERA_HEIGHT):
+    print(f"Warning: Camera is using {actual_width}x{actual_height}")
+
+# Run the (expensive) face detector only every Nth frame; in between, faces
+# are followed by lightweight KCF trackers (face position is temporally coherent)
+DETECTION_INTERVAL = 5
+
+# KCF trackers ship with opencv-contrib-python; without them cached boxes are drawn
+HAS_KCF_TRACKER = hasattr(cv2, "TrackerKCF_create")
 
 # Drawing parameters for the face bounding boxes
 BORDER_COLOR = (0, 255, 0)  # Green color in BGR format
 BORDER_THICKNESS = 2         # Thickness of the rectangle border in pixels
 
-# Draw rectangles around detected faces
-for (x_coord, y_coord, width, height) in faces:
-    cv2.rectangle(
-        mirrored_frame,                   # Image to draw on
-        (x_coord, y_coord),               # Top-left corner coordinates
-        (x_coord + width, y_coord + height),  # Bottom-right corner coordinates
-        BORDER_COLOR,                     # Rectangle color
-        BORDER_THICKNESS                  # Line thickness
-    )
+frame_index = 0
+faces = []       # Last known (x, y, width, height) box of each face
+trackers = []    # One KCF tracker per entry in faces
+
+while True:
+    # Read the next frame from the camera
+    ret, frame = cap.read()
+    if not ret:
+        print("Error: Failed to grab frame from camera")
+        break  # Stop if frame capture fails
+
+    # Mirror the frame horizontally for more intuitive user experience (like a mirror)
+    mirrored_frame = cv2.flip(frame, 1)
+
+    if frame_index % DETECTION_INTERVAL == 0:
+        if face_detector is not None:
+            # Detect faces using the DNN detector (works directly on the color frame)
+            frame_height, frame_width = mirrored_frame.shape[:2]
+            face_detector.setInputSize((frame_width, frame_height))
+            _, detections = face_detector.detect(mirrored_frame)
+
+            # Each detection row is [x, y, width, height, landmarks..., score]
+            # Note: detections is None when no faces are found
+            detections = [] if detections is None else detections[:, :4]
+        else:
+            # Convert the color frame to grayscale (Haar Cascades work on grayscale images)
+            gray = cv2.cvtColor(mirrored_frame, cv2.COLOR_BGR2GRAY)
+
+            # Detect faces using the Haar Cascade classifier
+            # Note: flags is a legacy parameter, not needed in newer OpenCV
+            detections = face_cascade.detectMultiScale(
+                gray,
+                scaleFactor=SCALE_FACTOR,
+                minNeighbors=MIN_NEIGHBORS,
+                minSize=MIN_FACE_SIZE
+            )
+
+        faces = [tuple(int(value) for value in face) for face in detections]
+
+        # Start a tracker per face to follow it until the next detection
+        trackers = []
+        if HAS_KCF_TRACKER:
+            for face in faces:
+                tracker = cv2.TrackerKCF_create()
+                tracker.init(mirrored_frame, face)
+                trackers.append(tracker)
+    else:
+        # Move each face box with its tracker (a lost face keeps its last box)
+        for index, tracker in enumerate(trackers):
+            is_tracked, box = tracker.update(mirrored_frame)
+            if is_tracked:
+                faces[index] = tuple(int(value) for value in box)
+
+    # Draw rectangles around detected faces with a single call for all faces
+    if faces:
+        x_coord, y_coord, width, height = np.array(faces, np.int32).T
+
+        # Corners of each box in drawing order: (N faces, 4 corners, x/y)
+        corners = np.stack([
+            np.stack([x_coord, y_coord], axis=-1),                   # Top-left
+            np.stack([x_coord + width, y_coord], axis=-1),           # Top-right
+            np.stack([x_coord + width, y_coord + height], axis=-1),  # Bottom-right
+            np.stack([x_coord, y_coord + height], axis=-1)           # Bottom-left
+        ], axis=1)
+
+        cv2.polylines(
+            mirrored_frame,                   # Image to draw on
+            list(corners),                    # One closed polygon per face
+            isClosed=True,
+            color=BORDER_COLOR,               # Rectangle color
+            thickness=BORDER_THICKNESS        # Line thickness
+        )
+
+    # Display the resulting frame with face detections
+    cv2.imshow("Face Detection", mirrored_frame)
 
-# Display the resulting frame with face detections
-cv2.imshow("Face Detection", mirrored_frame)
+    frame_index += 1
 
-# Wait indefinitely for a key press (0 = wait forever)
-# Note: The window will close when any key is pressed
-cv2.waitKey(0)
+    # Exit on 'q' key press
+    if cv2.waitKey(1) == ord('q'):
+        break
 
 # Release the camera resource and close all OpenCV windows
 cap.release()
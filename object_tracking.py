@@ -1,26 +1,155 @@
+import argparse
+import math
+import os
+import queue
+import threading
+
 import cv2
+import numpy as np
+
+try:
+    from numba_fused import flip_gray
+except ImportError:
+    # Numba is optional; fall back to separate OpenCV flip + cvtColor passes
+    flip_gray = None
+
+# Limit OpenCV's worker threads to physical cores (hyperthreads cause cache thrashing)
+# Note: os.cpu_count() reports logical cores, usually 2 per physical core
+cv2.setNumThreads(max(1, (os.cpu_count() or 2) // 2))
 
 # Template matching method
 # - TM_CCOEFF_NORMED is good for brightness/contrast changes
+# - Note: OpenCV computes the template mean/norm once per call, so the
+#   per-frame cost is dominated by the sliding window, not the template
 MATCHING_METHOD = cv2.TM_CCOEFF_NORMED
 
+# Track with OpenCV's MOSSE correlation filter instead of template matching
+# - Correlates in the frequency domain (FFT), far cheaper than matchTemplate
+# - Requires opencv-contrib-python (cv2.legacy); falls back to template matching
+USE_MOSSE_TRACKER = True
+
 # Minimum threshold for considering a template match valid (0.0 to 1.0)
 MIN_THRESHOLD = 0.8
 
+# Scale factor applied to frame and template before matching
+# - 0.5 cuts matching work by ~16x with negligible accuracy loss
+MATCH_SCALE = 0.5
+
+# Smallest ROI side (in pixels) that is still at least 1 pixel after downscaling
+MIN_ROI_SIZE = math.ceil(1 / MATCH_SCALE)
+
+# Margin around the previous match (in template heights) searched before
+# falling back to a full-frame search
+SEARCH_MARGIN = 2
+
+# Image pyramid used when the object is lost near its previous location
+# - Each level halves the resolution of the one before it
+# - Levels whose template would be smaller than the minimum size are skipped
+PYRAMID_LEVELS = 2
+MIN_PYRAMID_TEMPLATE_SIZE = 8
+
+# Run matchTemplate on every Nth frame; positions in between are extrapolated
+# from the measured velocity (objects barely move between frames at 30 FPS)
+MATCH_INTERVAL = 2
+
+# Poll the keyboard every Nth frame (GUI polling costs 1-2 ms on some platforms)
+KEY_POLL_INTERVAL = 4
+
 # Display settings for text overlay
 FONT_SIZE = 0.5
 FONT_COLOR = (0, 255, 0)  # Green color for text (BGR format)
 FONT_THICKNESS = 2
 
-def get_frame(camera):
+# Camera capture settings
+# - A buffer of 1 frame makes each read() return the newest frame instead of a stale one
+# - USE_RAW_YUYV requests raw YUYV frames (CAP_PROP_CONVERT_RGB=0) so OpenCV skips
+#   its BGR conversion and the Y plane is used directly as grayscale
+# - CAMERA_FOURCC is the fallback when raw YUYV is disabled or not supported;
+#   MJPG lets the driver deliver BGR frames at a higher FPS than converted YUYV
+CAMERA_BUFFER_SIZE = 1
+CAMERA_FOURCC = "MJPG"
+USE_RAW_YUYV = True
+
+# Requested capture resolution and frame rate
+# - Tracking quality saturates around 640x480; larger frames only add cost
+CAMERA_WIDTH = 640
+CAMERA_HEIGHT = 480
+CAMERA_FPS = 30
+
+# Seconds the main loop waits for a new frame before re-checking the stop flag
+FRAME_TIMEOUT = 1.0
+
+# Number of reusable (frame, gray) buffer pairs shared by the capture thread
+# and the main loop: one being captured, one queued, one being processed
+FRAME_BUFFER_COUNT = 3
+
+def request_bgr_frames(camera):
+    """
+    Switch the camera to converted BGR frames in the CAMERA_FOURCC format.
+
+    Args:
+        camera: OpenCV VideoCapture object
+    """
+    # Turn OpenCV's BGR conversion back on in case raw frames were requested
+    camera.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+
+    # Request compressed frames where supported (not all backends accept it)
+    try:
+        if not camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*CAMERA_FOURCC)):
+            print(f"Warning: Camera does not support {CAMERA_FOURCC} frames")
+    except cv2.error as e:
+        print(f"Warning: Could not set camera FOURCC: {e}")
+
+def configure_camera(camera):
+    """
+    Tune the camera capture settings for low latency.
+
+    Args:
+        camera: OpenCV VideoCapture object
+    """
+    # Keep only the most recent frame in the driver-side buffer
+    camera.set(cv2.CAP_PROP_BUFFERSIZE, CAMERA_BUFFER_SIZE)
+
+    # Request raw YUYV frames; set() returns False when the backend rejects a property
+    is_raw = False
+    if USE_RAW_YUYV:
+        try:
+            is_raw = (
+                camera.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+                and camera.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"YUYV"))
+            )
+        except cv2.error as e:
+            print(f"Warning: Could not request raw YUYV frames: {e}")
+        if not is_raw:
+            print("Warning: Raw YUYV not supported, using BGR frames")
+
+    if not is_raw:
+        request_bgr_frames(camera)
+
+    # Cap the per-frame cost by requesting a lower resolution and fixed FPS
+    camera.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+    camera.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+    camera.set(cv2.CAP_PROP_FPS, CAMERA_FPS)
+
+    # The driver may pick the closest supported mode, so report what it chose
+    actual_width = int(camera.get(cv2.CAP_PROP_FRAME_WIDTH))
+    actual_height = int(camera.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    actual_fps = camera.get(cv2.CAP_PROP_FPS)
+    if (actual_width, actual_height) != (CAMERA_WIDTH, CAMERA_HEIGHT):
+        print(f"Warning: Camera is using {actual_width}x{actual_height} at {actual_fps:.0f} FPS")
+
+def get_frame(camera, buffers=None):
     """
     Capture a single frame from the camera.
 
     Args:
         camera: OpenCV VideoCapture object
+        buffers: Optional preallocated (frame, gray) pair to write into
 
     Returns:
-        Frame flipped horizontally for mirror effect
+        tuple: (frame, gray) - frame is either a mirrored BGR image or a raw
+        (H, W, 2) YUYV image (see get_display_frame()); gray is always
+        flipped horizontally for mirror effect
 
     Raises:
         Exception: If frame cannot be read from camera
@@ -29,8 +158,109 @@ def get_frame(camera):
     if not is_success:
         raise Exception("Failed to read frame from camera")
 
+    # Raw YUYV frames come back as a flat byte buffer instead of a BGR image
+    # Note: only the gray buffer is reused here; the raw frame is kept as-is
+    if frame.ndim != 3 or frame.shape[2] != 3:
+        return split_yuyv(camera, frame, gray=buffers[1] if buffers else None)
+
+    # Reuse the caller's buffers so the same memory stays hot across frames
+    if buffers is None:
+        flipped = np.empty_like(frame)
+        gray = np.empty(frame.shape[:2], np.uint8)
+    else:
+        flipped, gray = buffers
+
     # Flip horizontally to create mirror effect (more intuitive for user)
-    return cv2.flip(frame, 1)
+    if flip_gray is None:
+        flipped = cv2.flip(frame, 1, dst=flipped)
+        gray = cv2.cvtColor(flipped, cv2.COLOR_BGR2GRAY, dst=gray)
+        return flipped, gray
+
+    # Fused kernel: flip and grayscale conversion in a single pass over the frame
+    flip_gray(frame, flipped, gray)
+
+    return flipped, gray
+
+def split_yuyv(camera, raw, gray=None):
+    """
+    Extract the luminance plane from a raw YUYV frame.
+
+    Args:
+        camera: OpenCV VideoCapture object (used for the frame size)
+        raw: Raw frame returned by camera.read() with CAP_PROP_CONVERT_RGB off
+        gray: Optional preallocated output buffer for the mirrored Y plane
+
+    Returns:
+        tuple: (yuyv, gray) - raw frame viewed as (H, W, 2) and the mirrored
+        Y plane
+
+    Raises:
+        Exception: If the raw frame is not YUYV at the camera's resolution
+    """
+    width = int(camera.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(camera.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    if raw.size != width * height * 2:
+        raise Exception("Unsupported raw frame format from camera")
+
+    # YUYV packs two pixels as [Y0 U Y1 V], so channel 0 of an (H, W, 2) view is Y
+    yuyv = raw.reshape(height, width, 2)
+
+    # Only luminance needs mirroring here; color is converted for display later
+    gray = cv2.flip(yuyv[..., 0], 1, dst=gray)
+
+    return yuyv, gray
+
+def get_display_frame(frame, dst=None):
+    """
+    Get the mirrored BGR image to draw on and display.
+
+    Args:
+        frame: Frame from get_frame() (mirrored BGR or raw YUYV)
+        dst: Optional preallocated BGR buffer for converted YUYV frames
+
+    Returns:
+        Mirrored BGR frame
+    """
+    # BGR frames are already mirrored by get_frame()
+    if frame.shape[2] == 3:
+        return frame
+
+    # Convert only frames that are actually shown, then mirror to match the Y plane
+    bgr = cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_YUYV)
+    return cv2.flip(bgr, 1, dst=dst)
+
+def capture_frames(camera, frame_queue, free_buffers, stop_event):
+    """
+    Producer loop that keeps the queue filled with the newest camera frame.
+
+    Runs on its own thread so camera I/O overlaps with template matching.
+
+    Args:
+        camera: OpenCV VideoCapture object
+        frame_queue: queue.Queue(maxsize=1) holding the latest (frame, gray) pair
+        free_buffers: queue.Queue of (frame, gray) pairs available for writing
+        stop_event: threading.Event that ends the loop when set
+    """
+    while not stop_event.is_set():
+        try:
+            # Wait for the main loop to hand back a buffer pair
+            buffers = free_buffers.get(timeout=FRAME_TIMEOUT)
+        except queue.Empty:
+            continue
+
+        try:
+            frames = get_frame(camera=camera, buffers=buffers)
+        except Exception as e:
+            print(f"Camera error: {e}")
+            stop_event.set()
+            break
+
+        # Drop the stale frame (if any) so the consumer always gets the newest one
+        try:
+            free_buffers.put(frame_queue.get_nowait())
+        except queue.Empty:
+            pass
+        frame_queue.put(frames, block=True)
 
 def get_roi(frame):
     """
@@ -63,24 +293,107 @@ def get_template(roi, frame):
 
     Args:
         roi: (x, y, width, height) tuple defining region
-        frame: Source image to extract from
+        frame: Grayscale frame from get_frame() (the same luminance the
+            frames are matched on)
 
     Returns:
-        The template image (ROI portion of frame)
+        The grayscale template image (ROI portion of frame)
     """
     roi_x, roi_y, roi_width, roi_height = roi
 
     # Array slicing to extract region: frame[y:y+h, x:x+w]
-    template = frame[roi_y : roi_y + roi_height, roi_x : roi_x + roi_width]
+    # Note: copied so the template does not alias a reusable frame buffer
+    return frame[roi_y : roi_y + roi_height, roi_x : roi_x + roi_width].copy()
+
+def downscale(image, interpolation=cv2.INTER_LINEAR, dst=None):
+    """
+    Shrink an image by MATCH_SCALE for faster template matching.
 
-    return template
+    Args:
+        image: Image to resize
+        interpolation: OpenCV interpolation flag
+        dst: Optional preallocated output buffer
+
+    Returns:
+        The resized image
+    """
+    return cv2.resize(
+        image, None, dst=dst, fx=MATCH_SCALE, fy=MATCH_SCALE, interpolation=interpolation
+    )
+
+def prepare_template(template):
+    """
+    Convert the template into the exact form matchTemplate consumes.
+
+    Done once after ROI selection so no template work is repeated per frame.
+
+    Args:
+        template: Grayscale template image from get_template()
+
+    Returns:
+        list: Template pyramid as UMats, starting with the downscaled template
+    """
+    # INTER_AREA gives the best quality when shrinking
+    template_small = downscale(template, interpolation=cv2.INTER_AREA)
+
+    # Build coarser levels while the template stays large enough to match
+    template_pyramid = [template_small]
+    for _ in range(PYRAMID_LEVELS):
+        height, width = template_pyramid[-1].shape[:2]
+        if min((width + 1) // 2, (height + 1) // 2) < MIN_PYRAMID_TEMPLATE_SIZE:
+            break
+        template_pyramid.append(cv2.pyrDown(template_pyramid[-1]))
+
+    # Upload once; the same device buffers are reused for every frame
+    return [cv2.UMat(level) for level in template_pyramid]
+
+def get_scaled_size(image):
+    """
+    Get the (width, height) an image has after downscale().
+
+    Args:
+        image: Full-resolution image
+
+    Returns:
+        tuple: (width, height) of the downscaled image
+    """
+    height, width = image.shape[:2]
+    return round(width * MATCH_SCALE), round(height * MATCH_SCALE)
+
+def get_search_window(last_loc, frame_size, template_size, margin=None):
+    """
+    Compute a padded search window around the previous match location.
+
+    Args:
+        last_loc: (x,y) of the previous match in the downscaled frame
+        frame_size: (width, height) of the downscaled frame
+        template_size: (width, height) of the downscaled template
+        margin: Padding in pixels (defaults to SEARCH_MARGIN template heights)
+
+    Returns:
+        tuple: (x0, y0, x1, y1) window bounds clipped to the frame
+    """
+    last_x, last_y = last_loc
+    frame_width, frame_height = frame_size
+    template_width, template_height = template_size
+
+    if margin is None:
+        margin = SEARCH_MARGIN * template_height
+
+    # Pad the previous match on all sides, clipped to the frame bounds
+    x0 = max(0, last_x - margin)
+    y0 = max(0, last_y - margin)
+    x1 = min(frame_width, last_x + template_width + margin)
+    y1 = min(frame_height, last_y + template_height + margin)
+
+    return x0, y0, x1, y1
 
 def get_result(result):
     """
     Analyze template matching result to find best match location.
 
     Args:
-        result: Template matching result matrix from cv2.matchTemplate()
+        result: Template matching result matrix (ndarray or UMat) from cv2.matchTemplate()
 
     Returns:
         tuple: (max_val, max_loc) - best match value and location
@@ -94,19 +407,92 @@ def get_result(result):
 
     return max_val, max_loc
 
+def search_pyramid(uframe_small, template_pyramid, frame_size, template_size):
+    """
+    Coarse-to-fine search used when the object is lost near its last location.
+
+    Matches on the coarsest pyramid level first and, once a level clears the
+    threshold, refines the match with a small search in the downscaled frame.
+
+    Args:
+        uframe_small: Downscaled grayscale frame (pyramid level 0)
+        template_pyramid: Template levels from prepare_template()
+        frame_size: (width, height) of the downscaled frame
+        template_size: (width, height) of the downscaled template
+
+    Returns:
+        tuple: (max_val, max_loc) - best match value and location in the
+        downscaled frame
+    """
+    # Build the frame pyramid to the same depth as the template pyramid
+    frame_pyramid = [uframe_small]
+    for _ in template_pyramid[1:]:
+        frame_pyramid.append(cv2.pyrDown(frame_pyramid[-1]))
+
+    # Try the coarsest (cheapest) level first
+    for level in range(len(template_pyramid) - 1, 0, -1):
+        result = cv2.matchTemplate(
+            frame_pyramid[level], template_pyramid[level], MATCHING_METHOD
+        )
+        coarse_val, coarse_loc = get_result(result)
+        if coarse_val < MIN_THRESHOLD:
+            continue
+
+        # Coarse location is accurate to one pixel at this level
+        scale = 2 ** level
+        seed = (coarse_loc[0] * scale, coarse_loc[1] * scale)
+
+        # Refine with a small search around the seed
+        x0, y0, x1, y1 = get_search_window(
+            seed, frame_size, template_size, margin=scale
+        )
+        usearch = cv2.UMat(uframe_small, (y0, y1), (x0, x1))
+        result = cv2.matchTemplate(usearch, template_pyramid[0], MATCHING_METHOD)
+        res_val, res_loc = get_result(result)
+        if res_val >= MIN_THRESHOLD:
+            return res_val, (res_loc[0] + x0, res_loc[1] + y0)
+
+    return 0.0, (0, 0)  # No good match found
+
+def predict_location(last_loc, velocity, frame_size, template_size):
+    """
+    Extrapolate the next match location assuming constant velocity.
+
+    Args:
+        last_loc: (x,y) of the last known location in the downscaled frame
+        velocity: (dx,dy) movement per frame in downscaled pixels
+        frame_size: (width, height) of the downscaled frame
+        template_size: (width, height) of the downscaled template
+
+    Returns:
+        tuple: (x,y) predicted location, clipped so the template stays in frame
+    """
+    frame_width, frame_height = frame_size
+    template_width, template_height = template_size
+
+    predicted_x = round(last_loc[0] + velocity[0])
+    predicted_y = round(last_loc[1] + velocity[1])
+
+    return (
+        min(max(predicted_x, 0), frame_width - template_width),
+        min(max(predicted_y, 0), frame_height - template_height)
+    )
+
 def get_tl_and_br_coordinates(max_loc, roi):
     """
     Calculate bounding box coordinates from match location and ROI size.
 
     Args:
-        max_loc: (x,y) of top-left corner of best match
+        max_loc: (x,y) of top-left corner of best match in the downscaled frame
         roi: Original ROI dimensions (width, height used)
 
     Returns:
-        tuple: (top_left, bottom_right) coordinates
+        tuple: (top_left, bottom_right) coordinates in the full-resolution frame
     """
-    top_left_coordinates = max_loc
-    top_left_x, top_left_y = top_left_coordinates
+    # Map the match location back to full-resolution coordinates
+    top_left_x = int(max_loc[0] / MATCH_SCALE)
+    top_left_y = int(max_loc[1] / MATCH_SCALE)
+    top_left_coordinates = (top_left_x, top_left_y)
 
     # Unpack ROI dimensions (only need width/height)
     _, _, roi_width, roi_height = roi
@@ -119,13 +505,38 @@ def get_tl_and_br_coordinates(max_loc, roi):
 
     return top_left_coordinates, bottom_right_coordinates
 
+def create_tracker(frame, roi):
+    """
+    Create a MOSSE correlation-filter tracker initialized on the ROI.
+
+    Args:
+        frame: Grayscale frame the ROI was selected on
+        roi: (x, y, width, height) tuple defining region
+
+    Returns:
+        Initialized tracker, or None to use template matching only
+    """
+    if not USE_MOSSE_TRACKER:
+        return None
+
+    # cv2.legacy only ships with opencv-contrib-python
+    if not hasattr(getattr(cv2, "legacy", None), "TrackerMOSSE_create"):
+        print("Warning: MOSSE tracker not available, using template matching")
+        return None
+
+    tracker = cv2.legacy.TrackerMOSSE_create()
+    tracker.init(frame, roi)
+
+    return tracker
+
 def draw_rectangle(frame, max_val, top_left, bottom_right):
     """
     Draw bounding box and confidence text on the frame.
 
     Args:
         frame: Image to draw on
-        max_val: Match confidence value (0.0-1.0)
+        max_val: Match confidence value (0.0-1.0), or None if the tracker
+            does not report one
         top_left: (x,y) of bounding box top-left corner
         bottom_right: (x,y) of bounding box bottom-right corner
     """
@@ -137,10 +548,11 @@ def draw_rectangle(frame, max_val, top_left, bottom_right):
     # Draw green rectangle around matched area
     cv2.rectangle(frame, top_left, bottom_right, (0, 255, 0), 2)
 
-    # Display match confidence percentage
+    # Display match confidence percentage (MOSSE has no confidence score)
+    label = "Tracking" if max_val is None else f"Match: {max_val:.2f}"
     cv2.putText(
         frame,
-        f"Match: {max_val:.2f}",  # Format to 2 decimal places
+        label,
         text_position,
         cv2.FONT_HERSHEY_SIMPLEX,
         FONT_SIZE,
@@ -148,58 +560,239 @@ def draw_rectangle(frame, max_val, top_left, bottom_right):
         FONT_THICKNESS
     )
 
+def parse_args():
+    """
+    Parse command line options.
+
+    Returns:
+        argparse.Namespace with the parsed options
+    """
+    parser = argparse.ArgumentParser(description="Track a selected object in the camera feed.")
+    parser.add_argument(
+        "--render-every",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Only display every Nth frame (reduces GUI cost on slow displays)"
+    )
+    return parser.parse_args()
+
 def main():
-    """Main program loop for template matching tracking."""
+    """Main program loop for MOSSE / template matching tracking."""
+    args = parse_args()
+    render_every = max(1, args.render_every)
+
     input("Look at the camera. Press enter to start object tracking...")
+
+    # Enable OpenCL (T-API) so UMat operations can run on the GPU
+    cv2.ocl.setUseOpenCL(True)
+    if not cv2.ocl.haveOpenCL():
+        print("Warning: OpenCL not available, falling back to CPU")
     
     # Initialize camera capture
     camera = cv2.VideoCapture(0)
     if not camera.isOpened():
         print("Error: Could not open camera")
         return
+    configure_camera(camera)
 
     # Get initial frame and let user select ROI
-    sample_frame = get_frame(camera=camera)
-    roi = get_roi(frame=sample_frame)
-
-    # Check if ROI was properly selected (width/height > 0)
-    if roi[2] == 0 or roi[3] == 0:
-        print("Error: Invalid ROI selection")
+    try:
+        sample_frame, sample_gray = get_frame(camera=camera)
+    except Exception as e:
+        # Raw YUYV can be accepted by set() yet not delivered; retry with BGR frames
+        print(f"Warning: {e}, retrying with BGR frames")
+        request_bgr_frames(camera)
+        try:
+            sample_frame, sample_gray = get_frame(camera=camera)
+        except Exception as e:
+            print(f"Camera error: {e}")
+            camera.release()
+            return
+    sample_display = get_display_frame(sample_frame)
+    roi = get_roi(frame=sample_display)
+
+    # Check if ROI was properly selected (large enough to survive downscaling)
+    if roi[2] < MIN_ROI_SIZE or roi[3] < MIN_ROI_SIZE:
+        print(f"Error: Invalid ROI selection (minimum {MIN_ROI_SIZE}x{MIN_ROI_SIZE} pixels)")
         camera.release()
         return
 
-    # Extract template from selected ROI
-    template = get_template(roi, frame=sample_frame)
+    # Extract template from selected ROI and prepare it for matching
+    template = get_template(roi, frame=sample_gray)
+    template_pyramid = prepare_template(template)
+    utemplate = template_pyramid[0]
+
+    # Prefer the MOSSE tracker when available (None means template matching)
+    tracker = create_tracker(sample_gray, roi)
+
+    # Sizes in downscaled coordinates, used to bound the local search window
+    frame_size = get_scaled_size(sample_frame)
+    template_size = get_scaled_size(template)
+
+    # Start the local search at the selected ROI
+    last_loc = (round(roi[0] * MATCH_SCALE), round(roi[1] * MATCH_SCALE))
+
+    # Motion state for frames where matching is skipped
+    # - velocity is None until two consecutive matches have been seen
+    frame_index = 0
+    velocity = None
+    match_loc, match_index, last_val = None, 0, 0.0
+
+    # Preallocate the downscaled frame and full-frame result on the device
+    # Note: local-window results vary in size near the edges, so only the
+    # full-frame result can be reused
+    frame_width, frame_height = frame_size
+    template_width, template_height = template_size
+    uframe_small = cv2.UMat(frame_height, frame_width, cv2.CV_8UC1)
+    ufull_result = cv2.UMat(
+        frame_height - template_height + 1,
+        frame_width - template_width + 1,
+        cv2.CV_32FC1
+    )
+
+    # Preallocate the host frame buffers cycled between the two threads
+    free_buffers = queue.Queue()
+    for _ in range(FRAME_BUFFER_COUNT):
+        free_buffers.put((
+            np.empty_like(sample_frame),
+            np.empty(sample_frame.shape[:2], np.uint8)
+        ))
+
+    # Reused for the BGR conversion of raw YUYV frames (main loop only)
+    display_buffer = np.empty_like(sample_display)
+
+    # Start capturing frames on a separate thread
+    frame_queue = queue.Queue(maxsize=1)
+    stop_event = threading.Event()
+    producer = threading.Thread(
+        target=capture_frames,
+        args=(camera, frame_queue, free_buffers, stop_event),
+        daemon=True
+    )
+    producer.start()
 
     # Main processing loop
-    while True:
+    while not stop_event.is_set():
         try:
-            # Get current frame from camera
-            frame = get_frame(camera=camera)
-        except Exception as e:
-            print(f"Camera error: {e}")
+            # Get the latest frame from the capture thread
+            frame, gray = frame_queue.get(timeout=FRAME_TIMEOUT)
+        except queue.Empty:
+            continue
+
+        frame_index += 1
+
+        # (max_val, top_left, bottom_right) of the box to draw, if any
+        match_box = None
+
+        # Template matching runs without MOSSE, or to re-acquire a lost object
+        is_tracked = False
+
+        if tracker is not None:
+            # MOSSE works on the grayscale frame and returns the box directly
+            is_tracked, box = tracker.update(gray)
+            if is_tracked:
+                box_x, box_y, box_width, box_height = (int(v) for v in box)
+                match_box = (
+                    None,
+                    (box_x, box_y),
+                    (box_x + box_width, box_y + box_height)
+                )
+
+                # Keep the template search centered on the object, so a
+                # re-acquisition starts with the cheap local window
+                # (clipped, since MOSSE boxes may extend past the frame edges)
+                last_loc = (
+                    min(max(round(box_x * MATCH_SCALE), 0), frame_size[0] - template_size[0]),
+                    min(max(round(box_y * MATCH_SCALE), 0), frame_size[1] - template_size[1])
+                )
+
+        if not is_tracked:
+            if velocity is not None and frame_index % MATCH_INTERVAL:
+                # Skip matching and extrapolate from the last measured velocity
+                res_val = last_val
+                res_loc = predict_location(last_loc, velocity, frame_size, template_size)
+            else:
+                # Perform template matching on a downscaled grayscale copy of the frame
+                # (color is only used for display/drawing)
+                try:
+                    # Wrap in UMat so resize/matchTemplate dispatch to OpenCL
+                    # (grayscale upload moves 3x less data than the color frame)
+                    ugray = cv2.UMat(gray)
+                    uframe_small = downscale(ugray, dst=uframe_small)
+
+                    # Search near the previous match first (inter-frame motion is small)
+                    x0, y0, x1, y1 = get_search_window(last_loc, frame_size, template_size)
+                    usearch = cv2.UMat(uframe_small, (y0, y1), (x0, x1))
+                    result = cv2.matchTemplate(usearch, utemplate, MATCHING_METHOD)
+
+                    # Get best match location and confidence
+                    res_val, res_loc = get_result(result)
+
+                    if res_val >= MIN_THRESHOLD:
+                        # Convert window-relative location to frame coordinates
+                        res_loc = (res_loc[0] + x0, res_loc[1] + y0)
+                    elif len(template_pyramid) > 1:
+                        # Object moved out of the window, search coarse-to-fine
+                        res_val, res_loc = search_pyramid(
+                            uframe_small, template_pyramid, frame_size, template_size
+                        )
+
+                    if res_val < MIN_THRESHOLD:
+                        # Every cheaper search missed (or the template is too small
+                        # for a pyramid), fall back to a full-frame search
+                        result = cv2.matchTemplate(
+                            uframe_small, utemplate, MATCHING_METHOD, result=ufull_result
+                        )
+                        res_val, res_loc = get_result(result)
+                except Exception as e:
+                    print(f"Processing error: {e}")
+                    res_val, res_loc = 0.0, (0, 0)
+
+                # Measure velocity against the previous match; a miss resets it so
+                # the next frame is matched again
+                if res_val >= MIN_THRESHOLD:
+                    if match_loc is not None:
+                        frames_elapsed = frame_index - match_index
+                        velocity = (
+                            (res_loc[0] - match_loc[0]) / frames_elapsed,
+                            (res_loc[1] - match_loc[1]) / frames_elapsed
+                        )
+                    match_loc, match_index, last_val = res_loc, frame_index, res_val
+                else:
+                    velocity, match_loc = None, None
+
+        # Only draw template matches if match confidence meets threshold
+        if not is_tracked and res_val >= MIN_THRESHOLD:
+            last_loc = res_loc
+            match_box = (res_val, *get_tl_and_br_coordinates(res_loc, roi))
+
+            if tracker is not None:
+                # Found again by template matching: restart MOSSE at the
+                # full-resolution box and reset the template motion state
+                (box_x, box_y), _ = match_box[1:]
+                tracker = create_tracker(gray, (box_x, box_y, roi[2], roi[3]))
+                velocity, match_loc = None, None
+
+        # Color is only needed from here on, for drawing and display,
+        # so skipped frames are never converted
+        if frame_index % render_every == 0:
+            display_frame = get_display_frame(frame, dst=display_buffer)
+            if match_box is not None:
+                draw_rectangle(display_frame, *match_box)
+
+            cv2.imshow("Camera Feed", display_frame)
+
+        # Hand the buffers back to the capture thread for reuse
+        free_buffers.put((frame, gray))
+
+        # Exit on 'q' key press (non-blocking poll, only every few frames)
+        if frame_index % KEY_POLL_INTERVAL == 0 and cv2.pollKey() == ord('q'):
             break
 
-        # Perform template matching
-        try:
-            result = cv2.matchTemplate(frame, template, MATCHING_METHOD)
-        except Exception as e:
-            print(f"Processing error: {e}")
-
-        # Get best match location and confidence
-        res_val, res_loc = get_result(result)
-
-        # Only draw if match confidence meets threshold
-        if res_val >= MIN_THRESHOLD:
-            top_left, bottom_right = get_tl_and_br_coordinates(res_loc, roi)
-            draw_rectangle(frame, res_val, top_left, bottom_right)
-
-        # Always show the current frame (prevent freezing)
-        cv2.imshow("Camera Feed", frame)
-
-        # Exit on 'q' key press
-        if cv2.waitKey(1) == ord('q'):
-            break
+    # Stop the capture thread before releasing the camera
+    stop_event.set()
+    producer.join()
 
     # Cleanup resources
     camera.release()